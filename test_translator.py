@@ -4,11 +4,16 @@ import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import tempfile
+import threading
 
 # Add parent directory to path to import our modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from translator import GoogleTranslator, LibreTranslator
+from translator import (GoogleTranslator, LibreTranslator, AhoCorasick, Glossary,
+                        CatalogTranslator, TranslationCatalog, build_catalogs,
+                        catalog_path, write_catalog, Quota, UsageTracker, QuotaScheduler,
+                        PriorityScheduler, GLOSSARY_ERROR, is_error_result)
 
 class TestGoogleTranslator(unittest.TestCase):
     """Test cases for GoogleTranslator class"""
@@ -57,6 +62,14 @@ class TestGoogleTranslator(unittest.TestCase):
         self.assertEqual(result, "Bonjour le monde")
         mock_gt.assert_called_once_with(source='auto', target='fr')
     
+    @patch('translator.GT')
+    def test_translate_text_language_codes(self, mock_gt):
+        """Test language codes are accepted as well as names"""
+        mock_gt.return_value.translate.return_value = "Hola"
+        
+        self.assertEqual(self.translator.translate_text("Hello", "en", "es"), "Hola")
+        mock_gt.assert_called_once_with(source='en', target='es')
+    
     def test_translate_text_unsupported_language(self):
         """Test translation with unsupported target language"""
         result = self.translator.translate_text("Hello", "english", "klingon")
@@ -156,6 +169,632 @@ class TestLibreTranslator(unittest.TestCase):
         self.assertIn("API error:", result)
 
 
+class TestAhoCorasick(unittest.TestCase):
+    """Test cases for AhoCorasick matcher"""
+    
+    def test_iter_matches_overlapping_terms(self):
+        """Test that all occurrences are reported, including suffixes"""
+        automaton = AhoCorasick(['he', 'she', 'his', 'hers'])
+        matches = sorted(automaton.iter_matches("ushers"))
+        found = [(start, end, automaton.terms[index]) for start, end, index in matches]
+        self.assertEqual(found, [(1, 4, 'she'), (2, 4, 'he'), (2, 6, 'hers')])
+    
+    def test_find_all_leftmost_longest(self):
+        """Test non-overlapping selection prefers leftmost, then longest"""
+        automaton = AhoCorasick(['New', 'New York', 'York City'])
+        matches = automaton.find_all("New York City")
+        self.assertEqual([automaton.terms[index] for _, _, index in matches], ['New York'])
+    
+    def test_empty_terms_ignored(self):
+        """Test that empty terms never match"""
+        automaton = AhoCorasick(['', 'a'])
+        self.assertEqual(automaton.terms, ['a'])
+        self.assertEqual(len(automaton.find_all("banana")), 3)
+
+
+class TestGlossary(unittest.TestCase):
+    """Test cases for Glossary class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.glossary = Glossary()
+        self.glossary.add_term("LetsTranslate")
+        self.glossary.add_term("invoice", "factura", "english", "spanish")
+    
+    def test_protect_and_restore(self):
+        """Test terms are shielded and restored for the matching pair"""
+        text, replacements = self.glossary.protect(
+            "LetsTranslate sends the invoice", "english", "spanish")
+        
+        self.assertEqual(text, "[[0]] sends the [[1]]")
+        self.assertEqual(replacements, ["LetsTranslate", "factura"])
+        self.assertIsNone(self.glossary.restore("[[0]] envía la [ [1] ]", replacements))
+        self.assertIsNone(self.glossary.restore("[[0]] [[0]] envía la [[1]]", replacements))
+        self.assertEqual(
+            self.glossary.restore("[[0]] envía la [[ 1 ]]", replacements),
+            "LetsTranslate envía la factura")
+    
+    def test_existing_placeholders_escaped(self):
+        """Test placeholder-looking source text survives a round trip unchanged"""
+        text, replacements = self.glossary.protect("See [[0]] and [[ 7 ]] in LetsTranslate",
+                                                   "english", "spanish")
+        
+        self.assertEqual(text, "See [[0]] and [[1]] in [[2]]")
+        self.assertEqual(self.glossary.restore(text, replacements),
+                         "See [[0]] and [[ 7 ]] in LetsTranslate")
+    
+    def test_pair_specific_terms(self):
+        """Test pair-specific entries do not leak into other pairs"""
+        text, replacements = self.glossary.protect("the invoice", "english", "french")
+        self.assertEqual(text, "the invoice")
+        self.assertEqual(replacements, [])
+    
+    def test_whole_words_only(self):
+        """Test terms inside longer words are not matched"""
+        text, _ = self.glossary.protect("invoices", "english", "spanish")
+        self.assertEqual(text, "invoices")
+    
+    def test_automaton_cached_per_pair(self):
+        """Test the matcher is compiled once and rebuilt after changes"""
+        first = self.glossary._get_automaton("english", "spanish")
+        self.assertIs(self.glossary._get_automaton("English", "Spanish"), first)
+        
+        self.glossary.add_term("receipt", "recibo", "english", "spanish")
+        self.assertIsNot(self.glossary._get_automaton("english", "spanish"), first)
+    
+    @patch('translator.GT')
+    def test_google_translator_uses_glossary(self, mock_gt):
+        """Test GoogleTranslator shields glossary terms from the backend"""
+        mock_translator_instance = MagicMock()
+        mock_translator_instance.translate.return_value = "[[0]] envía la [[1]]"
+        mock_gt.return_value = mock_translator_instance
+        
+        translator = GoogleTranslator(glossary=self.glossary)
+        result = translator.translate_text("LetsTranslate sends the invoice", "english", "spanish")
+        
+        mock_translator_instance.translate.assert_called_once_with("[[0]] sends the [[1]]")
+        self.assertEqual(result, "LetsTranslate envía la factura")
+    
+    @patch('translator.GT')
+    def test_google_translator_dropped_placeholder(self, mock_gt):
+        """Test a dropped placeholder is reported instead of silently retried"""
+        mock_translator_instance = MagicMock()
+        mock_translator_instance.translate.return_value = "[[0]] envía la"
+        mock_gt.return_value = mock_translator_instance
+        
+        translator = GoogleTranslator(glossary=self.glossary)
+        result = translator.translate_text("LetsTranslate sends the invoice", "english", "spanish")
+        
+        self.assertEqual(result, GLOSSARY_ERROR)
+        self.assertTrue(is_error_result(result))
+        mock_translator_instance.translate.assert_called_once_with("[[0]] sends the [[1]]")
+    
+    @patch('translator.requests.post')
+    def test_libre_translator_dropped_placeholder(self, mock_post):
+        """Test LibreTranslator reports a lost term without a second request"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {'translatedText': 'envía la [[1]]'}
+        mock_post.return_value = mock_response
+        
+        translator = LibreTranslator(glossary=self.glossary)
+        result = translator.translate_text("LetsTranslate sends the invoice", "en", "es")
+        
+        self.assertEqual(result, GLOSSARY_ERROR)
+        mock_post.assert_called_once()
+        self.assertEqual(mock_post.call_args[1]['data']['q'], "[[0]] sends the [[1]]")
+    
+    def test_names_and_codes_share_entries(self):
+        """Test entries apply whether languages are given as names or codes"""
+        self.glossary.add_term("receipt", "recibo", "en", "ES")
+        
+        for source, target in (("english", "spanish"), ("en", "es"), ("English", "es")):
+            _, replacements = self.glossary.protect("invoice receipt", source, target)
+            self.assertEqual(replacements, ["factura", "recibo"])
+    
+    def test_auto_source_uses_source_specific_entries(self):
+        """Test an auto-detected source applies entries of any source language"""
+        self.glossary.add_term("Rechnung", "factura", "german", "spanish")
+        
+        for source in ("auto", "auto-detect"):
+            _, replacements = self.glossary.protect("invoice Rechnung", source, "spanish")
+            self.assertEqual(replacements, ["factura", "factura"])
+        _, replacements = self.glossary.protect("invoice", "auto", "french")
+        self.assertEqual(replacements, [])
+
+
+class TestCatalogTranslator(unittest.TestCase):
+    """Test cases for compiled catalogs and CatalogTranslator"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.catalog_dir = self.temp_dir.name
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.temp_dir.cleanup()
+    
+    def test_write_and_lookup(self):
+        """Test round trip through a catalog file"""
+        path = os.path.join(self.catalog_dir, "spanish.ltc")
+        translations = {f"Message {i}": f"Mensaje {i}" for i in range(200)}
+        translations["Café ☕"] = "Cafetería ☕"
+        write_catalog(path, translations)
+        
+        catalog = TranslationCatalog(path)
+        try:
+            self.assertEqual(len(catalog), 201)
+            for key, value in translations.items():
+                self.assertEqual(catalog.lookup(key), value)
+            self.assertIsNone(catalog.lookup("Unknown"))
+        finally:
+            catalog.close()
+    
+    def test_invalid_file(self):
+        """Test that non-catalog files are rejected"""
+        path = os.path.join(self.catalog_dir, "bogus.ltc")
+        with open(path, 'wb') as f:
+            f.write(b"not a catalog")
+        
+        with self.assertRaises(ValueError):
+            TranslationCatalog(path)
+    
+    def test_short_and_truncated_files(self):
+        """Test files shorter than the header or their tables are rejected"""
+        short_path = os.path.join(self.catalog_dir, "short.ltc")
+        with open(short_path, 'wb') as f:
+            f.write(b"LTCT")
+        truncated_path = os.path.join(self.catalog_dir, "truncated.ltc")
+        write_catalog(truncated_path, {"Save": "Guardar", "Open": "Abrir"})
+        with open(truncated_path, 'r+b') as f:
+            f.truncate(30)
+        
+        for path in (short_path, truncated_path):
+            with self.assertRaises(ValueError):
+                TranslationCatalog(path)
+    
+    def test_broken_catalog_falls_back(self):
+        """Test a corrupt catalog is treated as missing"""
+        with open(catalog_path(self.catalog_dir, "spanish"), 'wb') as f:
+            f.write(b"LT")
+        fallback = MagicMock()
+        fallback.translate_text.return_value = "Guardar"
+        
+        translator = CatalogTranslator(self.catalog_dir, fallback=fallback)
+        self.assertEqual(translator.translate_text("Save", "english", "spanish"), "Guardar")
+        self.assertIsNone(translator.get_catalog("spanish"))
+    
+    def test_rebuild_while_open(self):
+        """Test rebuilding a catalog does not disturb a translator that has it mapped"""
+        backend = MagicMock()
+        backend.translate_text.side_effect = lambda text, source, target: text.upper()
+        messages = [f"m{i}" for i in range(3000)]
+        build_catalogs(messages, backend, "english", ["spanish"], self.catalog_dir)
+        
+        translator = CatalogTranslator(self.catalog_dir)
+        try:
+            self.assertEqual(translator.translate_text("m2999", "english", "spanish"), "M2999")
+            build_catalogs(messages[:10], backend, "english", ["spanish"], self.catalog_dir)
+            
+            self.assertEqual(translator.translate_text("m2999", "english", "spanish"), "M2999")
+            self.assertEqual(os.listdir(self.catalog_dir), ["spanish.ltc"])
+        finally:
+            translator.close()
+        
+        rebuilt = TranslationCatalog(catalog_path(self.catalog_dir, "spanish"))
+        try:
+            self.assertEqual(len(rebuilt), 10)
+        finally:
+            rebuilt.close()
+    
+    def test_unreadable_catalog_falls_back(self):
+        """Test a catalog path that cannot be opened is treated as missing"""
+        os.makedirs(catalog_path(self.catalog_dir, "spanish"))
+        fallback = MagicMock()
+        fallback.translate_text.return_value = "Guardar"
+        
+        translator = CatalogTranslator(self.catalog_dir, fallback=fallback)
+        self.assertEqual(translator.translate_text("Save", "english", "spanish"), "Guardar")
+    
+    def test_corrupt_entries_are_misses(self):
+        """Test entries pointing outside the file or at invalid UTF-8 are not returned"""
+        path = catalog_path(self.catalog_dir, "spanish")
+        write_catalog(path, {"Save": "Guardar"})
+        with open(path, 'r+b') as f:
+            data = bytearray(f.read())
+            data[-len(b"Guardar"):] = b"\xff" * len(b"Guardar")
+            f.seek(0)
+            f.write(data)
+        
+        catalog = TranslationCatalog(path)
+        try:
+            self.assertIsNone(catalog.lookup("Save"))
+        finally:
+            catalog.close()
+        
+        with open(path, 'r+b') as f:
+            # Point the value offset of the only entry far past the end
+            f.seek(12 + 8 + 8)
+            f.write((10 ** 6).to_bytes(4, 'little'))
+        catalog = TranslationCatalog(path)
+        try:
+            self.assertIsNone(catalog.lookup("Save"))
+        finally:
+            catalog.close()
+    
+    def test_language_cannot_escape_catalog_dir(self):
+        """Test path-like target languages never open files outside the directory"""
+        write_catalog(os.path.join(self.catalog_dir, "outside.ltc"), {"Save": "Guardar"})
+        nested_dir = os.path.join(self.catalog_dir, "catalogs")
+        os.makedirs(nested_dir)
+        
+        with self.assertRaises(ValueError):
+            catalog_path(nested_dir, "../outside")
+        translator = CatalogTranslator(nested_dir)
+        self.assertIsNone(translator.get_catalog("../outside"))
+        self.assertIn("Error:", translator.translate_text("Save", "english", "../outside"))
+    
+    def test_build_catalogs_skips_errors(self):
+        """Test bulk build writes one file per language and skips failures"""
+        backend = MagicMock()
+        backend.translate_text.side_effect = lambda text, source, target: (
+            "Translation error: timeout" if text == "Broken" else f"{target}:{text}")
+        
+        failures = build_catalogs(["Open", "Save", "Broken", "Open"], backend,
+                                  "english", ["spanish", "french"], self.catalog_dir)
+        
+        self.assertEqual(failures, {'spanish': ["Broken"], 'french': ["Broken"]})
+        self.assertEqual(backend.translate_text.call_count, 6)
+        self.assertTrue(os.path.exists(catalog_path(self.catalog_dir, "french")))
+    
+    def test_translate_hits_and_fallback(self):
+        """Test hits are served from the catalog and misses fall through"""
+        write_catalog(catalog_path(self.catalog_dir, "spanish"), {"Save": "Guardar"})
+        fallback = MagicMock()
+        fallback.translate_text.return_value = "Abrir"
+        
+        translator = CatalogTranslator(self.catalog_dir, fallback=fallback)
+        try:
+            self.assertEqual(translator.translate_text("Save", "english", "Spanish"), "Guardar")
+            self.assertEqual(translator.translate_text("Save", "auto", "spanish"), "Guardar")
+            fallback.translate_text.assert_not_called()
+            
+            self.assertEqual(translator.translate_text("Open", "english", "spanish"), "Abrir")
+            translator.translate_text("Save", "english", "german")
+            self.assertEqual(fallback.translate_text.call_count, 2)
+        finally:
+            translator.close()
+    
+    def test_translate_miss_without_fallback(self):
+        """Test a miss is reported as an error when there is no fallback"""
+        translator = CatalogTranslator(self.catalog_dir)
+        result = translator.translate_text("Save", "english", "spanish")
+        self.assertIn("Error:", result)
+
+
+class FakeClock:
+    """Manually advanced clock for time-dependent tests"""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestUsageTracker(unittest.TestCase):
+    """Test cases for UsageTracker class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.clock = FakeClock()
+        self.tracker = UsageTracker(
+            {'google': [{'seconds': 60, 'max_characters': 100, 'max_requests': 3}]},
+            clock=self.clock)
+    
+    def test_record_and_get_usage(self):
+        """Test counters are reported for lifetime and window"""
+        self.tracker.record('google', 40)
+        self.tracker.record('google', 10)
+        
+        usage = self.tracker.get_usage('google')
+        self.assertEqual(usage['characters'], 50)
+        self.assertEqual(usage['requests'], 2)
+        self.assertEqual(usage['windows'][60], {'characters': 50, 'requests': 2})
+    
+    def test_window_expires(self):
+        """Test usage slides out of the window but lifetime totals remain"""
+        self.tracker.record('google', 40)
+        self.clock.sleep(61)
+        
+        usage = self.tracker.get_usage('google')
+        self.assertEqual(usage['windows'][60], {'characters': 0, 'requests': 0})
+        self.assertEqual(usage['characters'], 40)
+    
+    def test_time_until_available(self):
+        """Test quota checks for characters, requests and oversized text"""
+        self.assertEqual(self.tracker.time_until_available('google', 100), 0)
+        self.assertIsNone(self.tracker.time_until_available('google', 101))
+        
+        self.tracker.record('google', 80)
+        wait = self.tracker.time_until_available('google', 30)
+        self.assertGreater(wait, 59)
+        self.assertLessEqual(wait, 61)
+        
+        self.clock.sleep(wait)
+        self.assertEqual(self.tracker.time_until_available('google', 30), 0)
+    
+    def test_unlimited_backend(self):
+        """Test backends without quotas are always available"""
+        self.assertEqual(self.tracker.time_until_available('libre', 10 ** 6), 0)
+    
+    def test_invalid_quotas(self):
+        """Test non-positive windows and negative limits are rejected"""
+        for kwargs in ({'seconds': 0}, {'seconds': -60},
+                       {'seconds': 60, 'max_characters': -1},
+                       {'seconds': 60, 'max_requests': -1}):
+            with self.assertRaises(ValueError):
+                Quota(**kwargs)
+        with self.assertRaises(ValueError):
+            UsageTracker({'google': [{'seconds': 0, 'max_requests': 1}]})
+    
+    def test_save_and_load(self):
+        """Test usage survives a restart"""
+        self.tracker.record('google', 70)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "usage.json")
+            self.tracker.save_to_file(path)
+            
+            restored = UsageTracker({'google': [Quota(60, max_characters=100)]}, clock=self.clock)
+            restored.load_from_file(path)
+        
+        self.assertEqual(restored.get_usage('google')['characters'], 70)
+        self.assertEqual(restored.get_usage('google')['windows'][60]['characters'], 70)
+        self.assertGreater(restored.time_until_available('google', 40), 0)
+    
+    def test_save_replaces_file_atomically(self):
+        """Test saving leaves only a complete usage file behind"""
+        self.tracker.record('google', 70)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "usage.json")
+            with open(path, 'w') as f:
+                f.write("stale")
+            
+            with patch('translator.json.dump', side_effect=OSError("disk full")):
+                self.tracker.save_to_file(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), "stale")
+            
+            self.tracker.save_to_file(path)
+            self.assertEqual(os.listdir(temp_dir), ["usage.json"])
+            restored = UsageTracker(clock=self.clock)
+            restored.load_from_file(path)
+            self.assertEqual(restored.get_usage('google')['characters'], 70)
+
+
+class TestQuotaScheduler(unittest.TestCase):
+    """Test cases for QuotaScheduler class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.clock = FakeClock()
+        self.google = MagicMock()
+        self.google.translate_text.return_value = "google"
+        self.libre = MagicMock()
+        self.libre.translate_text.return_value = "libre"
+        self.tracker = UsageTracker(
+            {'google': [{'seconds': 60, 'max_requests': 2}],
+             'libre': [{'seconds': 60, 'max_requests': 1}]},
+            clock=self.clock)
+    
+    def make_scheduler(self, **kwargs):
+        return QuotaScheduler({'google': self.google, 'libre': self.libre}, self.tracker,
+                              sleep=self.clock.sleep, **kwargs)
+    
+    def test_overflow_shifts_to_next_backend(self):
+        """Test requests move to the next backend once one is full"""
+        scheduler = self.make_scheduler(max_wait=0)
+        results = [scheduler.translate_text("Hi", "english", "spanish") for _ in range(4)]
+        
+        self.assertEqual(results, ["google", "google", "libre", "Error: Translation quota exceeded"])
+        self.assertEqual(scheduler.get_usage()['libre']['requests'], 1)
+    
+    def test_queues_until_quota_frees(self):
+        """Test requests wait for the window instead of failing"""
+        scheduler = self.make_scheduler(max_wait=120)
+        for _ in range(3):
+            scheduler.translate_text("Hi", "english", "spanish")
+        
+        start = self.clock.now
+        self.assertEqual(scheduler.translate_text("Hi", "english", "spanish"), "google")
+        self.assertGreater(self.clock.now - start, 59)
+    
+    @patch('translator.requests.post')
+    def test_overflow_to_libre_uses_language_codes(self, mock_post):
+        """Test overflow to a real LibreTranslator sends codes for language names"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {'translatedText': 'Hola'}
+        mock_post.return_value = mock_response
+        scheduler = QuotaScheduler({'google': self.google, 'libre': LibreTranslator()},
+                                   self.tracker, max_wait=0, sleep=self.clock.sleep)
+        
+        for _ in range(2):
+            scheduler.translate_text("Hello", "english", "spanish")
+        result = scheduler.translate_text("Hello", "english", "spanish")
+        
+        self.assertEqual(result, "Hola")
+        data = mock_post.call_args[1]['data']
+        self.assertEqual((data['source'], data['target']), ('en', 'es'))
+    
+    def test_max_text_length(self):
+        """Test over-long text is rejected before using any quota"""
+        scheduler = self.make_scheduler(max_text_length=5)
+        result = scheduler.translate_text("Too long", "english", "spanish")
+        
+        self.assertIn("Error:", result)
+        self.google.translate_text.assert_not_called()
+        self.assertEqual(scheduler.get_usage()['google']['requests'], 0)
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    """Test cases for PriorityScheduler class"""
+    
+    def setUp(self):
+        """Set up a backend that blocks on 'hold' until released"""
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.order = []
+        self.backend = MagicMock()
+        self.backend.translate_text.side_effect = self.fake_translate
+        self.schedulers = []
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.release.set()
+        for scheduler in self.schedulers:
+            scheduler.close()
+    
+    def fake_translate(self, text, source_lang, target_lang):
+        if text.startswith("hold"):
+            self.started.set()
+            self.release.wait(5)
+        self.order.append(text)
+        return text.upper()
+    
+    def make_scheduler(self, **kwargs):
+        scheduler = PriorityScheduler(self.backend, **kwargs)
+        self.schedulers.append(scheduler)
+        return scheduler
+    
+    def hold_worker(self, scheduler, **kwargs):
+        """Occupy a worker so later submissions queue up"""
+        future = scheduler.submit("hold", "english", "spanish", **kwargs)
+        self.assertTrue(self.started.wait(5))
+        return future
+    
+    def test_interactive_preempts_bulk(self):
+        """Test queued interactive requests run before queued bulk ones"""
+        scheduler = self.make_scheduler(workers=1)
+        self.hold_worker(scheduler, priority=PriorityScheduler.BULK)
+        bulk = [scheduler.submit(f"bulk {i}", "english", "spanish", PriorityScheduler.BULK)
+                for i in range(3)]
+        interactive = scheduler.submit("click", "english", "spanish", PriorityScheduler.INTERACTIVE)
+        
+        self.release.set()
+        self.assertEqual(interactive.result(5), "CLICK")
+        for future in bulk:
+            future.result(5)
+        self.assertEqual(self.order, ["hold", "click", "bulk 0", "bulk 1", "bulk 2"])
+    
+    def test_fair_queuing_between_tenants(self):
+        """Test tenants in one class are interleaved by weight"""
+        scheduler = self.make_scheduler(workers=1, weights={'b': 2})
+        self.hold_worker(scheduler)
+        futures = [scheduler.submit(f"a{i}", "english", "spanish", tenant='a') for i in range(3)]
+        futures += [scheduler.submit(f"b{i}", "english", "spanish", tenant='b') for i in range(4)]
+        
+        self.release.set()
+        for future in futures:
+            future.result(5)
+        self.assertEqual(self.order, ["hold", "b0", "a0", "b1", "b2", "a1", "b3", "a2"])
+    
+    def test_aging_prevents_starvation(self):
+        """Test a long-waiting bulk request overtakes fresh interactive ones"""
+        clock = FakeClock()
+        scheduler = self.make_scheduler(workers=1, aging_interval=1.0, clock=clock)
+        self.hold_worker(scheduler)
+        old_bulk = scheduler.submit("old bulk", "english", "spanish", PriorityScheduler.BULK)
+        clock.sleep(5)
+        fresh = scheduler.submit("fresh", "english", "spanish", PriorityScheduler.INTERACTIVE)
+        
+        self.release.set()
+        old_bulk.result(5)
+        fresh.result(5)
+        self.assertEqual(self.order, ["hold", "old bulk", "fresh"])
+    
+    def test_aging_uses_oldest_request_not_heap_head(self):
+        """Test a fresh cheap request in the same class does not reset its age"""
+        clock = FakeClock()
+        scheduler = self.make_scheduler(workers=1, aging_interval=1.0, clock=clock)
+        self.hold_worker(scheduler)
+        old_bulk = scheduler.submit("AAAAAA", "english", "spanish", PriorityScheduler.BULK, 'a')
+        clock.sleep(5)
+        young_bulk = scheduler.submit("y", "english", "spanish", PriorityScheduler.BULK, 'b')
+        fresh = scheduler.submit("inter", "english", "spanish", PriorityScheduler.INTERACTIVE)
+        self.assertAlmostEqual(scheduler.get_metrics()['bulk']['oldest_wait'], 5.0)
+        
+        self.release.set()
+        for future in (old_bulk, young_bulk, fresh):
+            future.result(5)
+        self.assertEqual(self.order, ["hold", "AAAAAA", "inter", "y"])
+    
+    def test_aged_backlog_keeps_fair_queuing(self):
+        """Test old requests alone in their class are still fairly queued"""
+        clock = FakeClock()
+        scheduler = self.make_scheduler(workers=1, aging_interval=1.0, clock=clock)
+        self.hold_worker(scheduler)
+        futures = [scheduler.submit(f"a{i}", "english", "spanish", PriorityScheduler.BULK, 'a')
+                   for i in range(3)]
+        futures.append(scheduler.submit("b0", "english", "spanish", PriorityScheduler.BULK, 'b'))
+        clock.sleep(5)
+        
+        self.release.set()
+        for future in futures:
+            future.result(5)
+        self.assertEqual(self.order, ["hold", "a0", "b0", "a1", "a2"])
+    
+    def test_weights_must_be_positive(self):
+        """Test zero and negative weights are rejected"""
+        with self.assertRaises(ValueError):
+            PriorityScheduler(self.backend, workers=1, weights={'a': 0})
+        
+        scheduler = self.make_scheduler(workers=1)
+        for weight in (0, -1):
+            with self.assertRaises(ValueError):
+                scheduler.set_weight('a', weight)
+        scheduler.set_weight('a', 0.5)
+        self.assertEqual(scheduler.translate_text("hi", "english", "spanish", tenant='a'), "HI")
+    
+    def test_reserved_worker_serves_interactive(self):
+        """Test interactive requests complete while bulk work occupies other workers"""
+        scheduler = self.make_scheduler(workers=2, reserved_workers=1)
+        self.hold_worker(scheduler, priority=PriorityScheduler.BULK)
+        queued_bulk = scheduler.submit("bulk", "english", "spanish", PriorityScheduler.BULK)
+        
+        result = scheduler.translate_text("click", "english", "spanish")
+        
+        self.assertEqual(result, "CLICK")
+        self.assertFalse(queued_bulk.done())
+    
+    def test_metrics(self):
+        """Test queue depth and wait metrics are reported per class"""
+        scheduler = self.make_scheduler(workers=1)
+        self.hold_worker(scheduler, priority=PriorityScheduler.BULK)
+        scheduler.submit("bulk", "english", "spanish", PriorityScheduler.BULK)
+        
+        metrics = scheduler.get_metrics()
+        self.assertEqual(metrics['bulk']['queue_depth'], 1)
+        self.assertEqual(metrics['bulk']['started'], 1)
+        self.assertEqual(metrics['interactive']['queue_depth'], 0)
+    
+    def test_backend_exception_propagates(self):
+        """Test backend exceptions are raised to the caller"""
+        self.backend.translate_text.side_effect = RuntimeError("boom")
+        scheduler = self.make_scheduler(workers=1)
+        
+        with self.assertRaises(RuntimeError):
+            scheduler.translate_text("Hello", "english", "spanish")
+    
+    def test_unknown_priority(self):
+        """Test invalid priority classes are rejected"""
+        scheduler = self.make_scheduler(workers=1)
+        with self.assertRaises(ValueError):
+            scheduler.submit("Hello", "english", "spanish", priority="urgent")
+
+
 class TestTranslatorIntegration(unittest.TestCase):
     """Integration tests for translator modules"""
     
@@ -0,0 +1,89 @@
+# tests/test_ui.py - Unit Tests for UI Helpers
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ui import TextBuffer
+
+class TestTextBuffer(unittest.TestCase):
+    """Test cases for TextBuffer class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.buffer = TextBuffer()
+    
+    def test_empty_buffer(self):
+        """Test a new buffer has a single empty line"""
+        self.assertEqual(self.buffer.line_count, 1)
+        self.assertEqual(self.buffer.length, 0)
+        self.assertEqual(self.buffer.get_text(), "")
+        self.assertEqual(self.buffer.get_lines(0, 1), "")
+    
+    def test_lines_and_trailing_newline(self):
+        """Test lines are indexed at newlines, including a trailing one"""
+        self.buffer.append("one\ntwo\n")
+        
+        self.assertEqual(self.buffer.line_count, 3)
+        self.assertEqual(self.buffer.get_lines(0, 1), "one\n")
+        self.assertEqual(self.buffer.get_lines(1, 2), "two\n")
+        self.assertEqual(self.buffer.get_lines(2, 3), "")
+        self.assertEqual(self.buffer.line_of(4), 1)
+        self.assertEqual(self.buffer.line_end(1), 8)
+    
+    def test_long_line_split_across_appends(self):
+        """Test a long line keeps being split when it continues in a later append"""
+        self.buffer.append("a" * 2500)
+        self.buffer.append("b" * 600 + "\n")
+        
+        limit = TextBuffer.MAX_LINE_LENGTH
+        self.assertEqual(list(self.buffer.line_starts), [0, limit, 2 * limit, 3 * limit, 3101])
+        self.assertEqual(self.buffer.get_lines(2, 3), "a" * 500 + "b" * 500)
+        self.assertEqual(self.buffer.get_lines(3, 4), "b" * 100 + "\n")
+        self.assertEqual(self.buffer.get_lines(4, 5), "")
+        self.assertEqual(self.buffer.get_text(), "a" * 2500 + "b" * 600 + "\n")
+    
+    def test_line_spanning_several_chunks(self):
+        """Test a line built from several appends is returned whole"""
+        for piece in ("Hel", "lo, ", "wor", "ld\nnext"):
+            self.buffer.append(piece)
+        
+        self.assertEqual(self.buffer.line_count, 2)
+        self.assertEqual(self.buffer.get_lines(0, 1), "Hello, world\n")
+        self.assertEqual(self.buffer.get_lines(1, 2), "next")
+        self.assertEqual(self.buffer.get_range(2, 9), "llo, wo")
+        self.assertEqual(self.buffer.get_range(3, 3), "")
+    
+    def test_get_lines_past_end(self):
+        """Test ranges beyond the last line are clamped"""
+        self.buffer.append("one\ntwo")
+        
+        self.assertEqual(self.buffer.get_lines(1, 10), "two")
+        self.assertEqual(self.buffer.get_lines(0, 10), "one\ntwo")
+        self.assertEqual(self.buffer.get_lines(5, 10), "")
+    
+    def test_iter_chunks(self):
+        """Test chunks stream the buffer contents in order"""
+        self.buffer.append("first ")
+        self.buffer.append("")
+        self.buffer.append("second")
+        self.assertEqual(list(self.buffer.iter_chunks()), ["first ", "second"])
+    
+    def test_clear(self):
+        """Test clearing resets text and line indexes"""
+        self.buffer.append("x" * 1500 + "\nmore")
+        self.buffer.clear()
+        
+        self.assertEqual(self.buffer.length, 0)
+        self.assertEqual(self.buffer.line_count, 1)
+        self.assertEqual(list(self.buffer.iter_chunks()), [])
+        
+        self.buffer.append("y" * 1200)
+        self.assertEqual(list(self.buffer.line_starts), [0, TextBuffer.MAX_LINE_LENGTH])
+
+
+if __name__ == '__main__':
+    unittest.main()
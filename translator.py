@@ -1,37 +1,326 @@
 # translator.py - Translation Backend Logic
 
 from deep_translator import GoogleTranslator as GT
+from collections import deque
+from concurrent.futures import Future
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
 import requests
 import json
+import re
+
+# Prefixes of the strings backends return instead of raising on failure
+ERROR_PREFIXES = ("Error:", "Translation error:", "API error:", "Translation failed")
+
+
+def is_error_result(result):
+    """Check whether a translate_text result is an error message"""
+    return not isinstance(result, str) or result.startswith(ERROR_PREFIXES)
+
+
+# Language names understood by the translators, mapped to ISO codes
+LANGUAGE_CODES = {
+    'english': 'en',
+    'spanish': 'es', 
+    'french': 'fr',
+    'german': 'de',
+    'hindi': 'hi',
+    'italian': 'it',
+    'japanese': 'ja',
+    'chinese': 'zh',
+    'russian': 'ru',
+    'arabic': 'ar',
+    'portuguese': 'pt',
+    'dutch': 'nl',
+    'korean': 'ko',
+    'swedish': 'sv',
+    'norwegian': 'no',
+    'danish': 'da',
+    'finnish': 'fi',
+    'greek': 'el',
+    'hebrew': 'he',
+    'thai': 'th',
+    'vietnamese': 'vi',
+    'turkish': 'tr'
+}
+
+AUTO_LANGUAGES = ('auto', 'auto-detect')
+
+
+def language_code(language):
+    """
+    Normalize a language name or code to a code
+    
+    Args:
+        language: Language name ('spanish'), code ('es') or 'auto'/'auto-detect'
+        
+    Returns:
+        ISO code, 'auto', or the lower-cased input if it is not a known name
+    """
+    language = language.lower()
+    if language in AUTO_LANGUAGES:
+        return 'auto'
+    return LANGUAGE_CODES.get(language, language)
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher built on an Aho-Corasick automaton"""
+    
+    def __init__(self, terms):
+        """
+        Compile the automaton for the given terms
+        
+        Args:
+            terms: Iterable of strings to search for (empty strings are ignored)
+        """
+        self.terms = [term for term in terms if term]
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [-1]      # index of the term ending at this node
+        self._dict_link = [0]    # nearest node on the fail chain with an output
+        
+        for index, term in enumerate(self.terms):
+            self._insert(term, index)
+        self._build_links()
+    
+    def _insert(self, term, index):
+        """Add a term to the trie"""
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(-1)
+                self._dict_link.append(0)
+                self._goto[node][char] = next_node
+            node = next_node
+        self._output[node] = index
+    
+    def _build_links(self):
+        """Compute failure and dictionary suffix links breadth-first"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                if self._output[self._fail[child]] >= 0:
+                    self._dict_link[child] = self._fail[child]
+                else:
+                    self._dict_link[child] = self._dict_link[self._fail[child]]
+                queue.append(child)
+    
+    def iter_matches(self, text):
+        """
+        Yield every term occurrence in text in a single pass
+        
+        Returns:
+            Generator of (start, end, term_index) tuples
+        """
+        goto, fail = self._goto, self._fail
+        output, dict_link = self._output, self._dict_link
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = node if output[node] >= 0 else dict_link[node]
+            while match:
+                index = output[match]
+                yield position + 1 - len(self.terms[index]), position + 1, index
+                match = dict_link[match]
+    
+    def find_all(self, text, accept=None):
+        """
+        Find non-overlapping matches, preferring leftmost then longest
+        
+        Args:
+            text: Text to search
+            accept: Optional callable(text, start, end) used to reject matches
+            
+        Returns:
+            List of (start, end, term_index) tuples in text order
+        """
+        candidates = [
+            match for match in self.iter_matches(text)
+            if accept is None or accept(text, match[0], match[1])
+        ]
+        candidates.sort(key=lambda match: (match[0], -match[1]))
+        
+        matches = []
+        last_end = 0
+        for start, end, index in candidates:
+            if start >= last_end:
+                matches.append((start, end, index))
+                last_end = end
+        return matches
+
+
+def _is_word_boundary(text, start, end):
+    """Check that a match does not start or end inside a word"""
+    if start > 0 and text[start].isalnum() and text[start - 1].isalnum():
+        return False
+    if end < len(text) and text[end - 1].isalnum() and text[end].isalnum():
+        return False
+    return True
+
+
+class Glossary:
+    """Fixed term translations and do-not-translate terms"""
+    
+    ANY_LANGUAGE = '*'
+    PLACEHOLDER = '[[{}]]'
+    # Backends sometimes pad placeholders with spaces, so allow for that
+    PLACEHOLDER_PATTERN = re.compile(r'\[\[\s*(\d+)\s*\]\]')
+    
+    def __init__(self):
+        self.terms = {}        # (source_lang, target_lang) -> {term: translation}
+        self._automata = {}    # compiled matchers cached per language pair
+    
+    def add_term(self, term, translation=None, source_lang=ANY_LANGUAGE, target_lang=ANY_LANGUAGE):
+        """
+        Add a glossary entry
+        
+        Args:
+            term: Source-language term to match (case-sensitive, whole words)
+            translation: Target-language term, or None to keep the term untranslated
+            source_lang: Source language name or code the entry applies to ('*' for any)
+            target_lang: Target language name or code the entry applies to ('*' for any)
+        """
+        if not term:
+            return
+        pair = (self._normalize(source_lang), self._normalize(target_lang))
+        self.terms.setdefault(pair, {})[term] = translation
+        self._automata.clear()
+    
+    def add_terms(self, terms, source_lang=ANY_LANGUAGE, target_lang=ANY_LANGUAGE):
+        """Add several entries from a {term: translation} mapping"""
+        for term, translation in terms.items():
+            self.add_term(term, translation, source_lang, target_lang)
+    
+    def _normalize(self, language):
+        """Key names and codes alike, so 'spanish' and 'es' share entries"""
+        if language == self.ANY_LANGUAGE:
+            return language
+        return language_code(language)
+    
+    def _get_automaton(self, source_lang, target_lang):
+        """Return the compiled matcher and replacements for a language pair"""
+        pair = (self._normalize(source_lang), self._normalize(target_lang))
+        cached = self._automata.get(pair)
+        if cached is None:
+            # With an auto-detected source any source-specific entry may apply,
+            # since terms are matched before the backend detects the language;
+            # conflicting sources are resolved in code order
+            if pair[0] == 'auto':
+                sources = sorted({key[0] for key in self.terms} - {self.ANY_LANGUAGE})
+            else:
+                sources = [pair[0]]
+            
+            # More specific entries override wildcard ones
+            keys = [(self.ANY_LANGUAGE, self.ANY_LANGUAGE)]
+            keys += [(source, self.ANY_LANGUAGE) for source in sources]
+            keys.append((self.ANY_LANGUAGE, pair[1]))
+            keys += [(source, pair[1]) for source in sources]
+            merged = {}
+            for key in keys:
+                merged.update(self.terms.get(key, {}))
+            automaton = AhoCorasick(merged)
+            replacements = [
+                term if merged[term] is None else merged[term]
+                for term in automaton.terms
+            ]
+            cached = (automaton, replacements)
+            self._automata[pair] = cached
+        return cached
+    
+    def protect(self, text, source_lang, target_lang):
+        """
+        Replace glossary terms in text with placeholders
+        
+        Args:
+            text: Source text
+            source_lang: Source language as passed to the translator
+            target_lang: Target language as passed to the translator
+            
+        Returns:
+            Tuple of (shielded text, list of replacement terms by placeholder index)
+        """
+        automaton, replacements = self._get_automaton(source_lang, target_lang)
+        
+        # Placeholder-looking text already in the source is shielded as itself,
+        # so restore can never rewrite it
+        matches = [(match.start(), match.end(), match.group(0))
+                   for match in self.PLACEHOLDER_PATTERN.finditer(text)]
+        if automaton.terms:
+            matches.extend((start, end, replacements[index])
+                           for start, end, index in automaton.find_all(text, _is_word_boundary))
+        if not matches:
+            return text, []
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        
+        parts = []
+        restored = []
+        last_end = 0
+        for start, end, replacement in matches:
+            if start < last_end:
+                continue
+            parts.append(text[last_end:start])
+            parts.append(self.PLACEHOLDER.format(len(restored)))
+            restored.append(replacement)
+            last_end = end
+        parts.append(text[last_end:])
+        return ''.join(parts), restored
+    
+    def restore(self, text, replacements):
+        """
+        Substitute target-language terms back in for placeholders
+        
+        Returns:
+            Restored text, or None if the backend dropped, duplicated or
+            mangled a placeholder so a term could not be restored exactly once
+        """
+        if not replacements:
+            return text
+        
+        counts = [0] * len(replacements)
+        
+        def substitute(match):
+            index = int(match.group(1))
+            if index < len(replacements):
+                counts[index] += 1
+                return replacements[index]
+            return match.group(0)
+        
+        result = self.PLACEHOLDER_PATTERN.sub(substitute, text)
+        if any(count != 1 for count in counts):
+            return None
+        return result
+
+
+# Returned when the backend mangles a glossary placeholder. Callers can retry
+# without the glossary; doing it here would silently drop the glossary and
+# spend a request that quota accounting never sees
+GLOSSARY_ERROR = "Error: Glossary terms could not be restored in the translation"
+
 
 class GoogleTranslator:
     """Translation service using deep-translator library"""
     
-    def __init__(self):
-        self.supported_languages = {
-            'english': 'en',
-            'spanish': 'es', 
-            'french': 'fr',
-            'german': 'de',
-            'hindi': 'hi',
-            'italian': 'it',
-            'japanese': 'ja',
-            'chinese': 'zh',
-            'russian': 'ru',
-            'arabic': 'ar',
-            'portuguese': 'pt',
-            'dutch': 'nl',
-            'korean': 'ko',
-            'swedish': 'sv',
-            'norwegian': 'no',
-            'danish': 'da',
-            'finnish': 'fi',
-            'greek': 'el',
-            'hebrew': 'he',
-            'thai': 'th',
-            'vietnamese': 'vi',
-            'turkish': 'tr'
-        }
+    def __init__(self, glossary=None):
+        self.glossary = glossary
+        self.supported_languages = dict(LANGUAGE_CODES)
     
     def get_supported_languages(self):
         """Return list of supported language names"""
@@ -50,16 +339,30 @@ class GoogleTranslator:
             Translated text or error message
         """
         try:
-            # Convert language names to codes
-            source_code = self.supported_languages.get(source_lang.lower(), 'auto')
-            target_code = self.supported_languages.get(target_lang.lower())
+            # Convert language names to codes (codes are accepted as-is)
+            codes = self.supported_languages.values()
+            source_code = language_code(source_lang)
+            if source_code not in codes:
+                source_code = 'auto'
+            target_code = language_code(target_lang)
             
-            if not target_code:
+            if target_code not in codes:
                 return "Error: Target language not supported"
             
+            # Shield glossary terms from the backend
+            replacements = []
+            shielded_text = text
+            if self.glossary is not None:
+                shielded_text, replacements = self.glossary.protect(text, source_lang, target_lang)
+            
             # Perform translation
             translator = GT(source=source_code, target=target_code)
-            result = translator.translate(text)
+            result = translator.translate(shielded_text)
+            
+            if replacements:
+                result = self.glossary.restore(result, replacements)
+                if result is None:
+                    return GLOSSARY_ERROR
             
             return result
             
@@ -80,17 +383,24 @@ class GoogleTranslator:
 class LibreTranslator:
     """Alternative translation service using LibreTranslate API"""
     
-    def __init__(self, base_url="https://libretranslate.com/translate", api_key=None):
+    def __init__(self, base_url="https://libretranslate.com/translate", api_key=None, glossary=None):
         self.base_url = base_url
         self.api_key = api_key
+        self.glossary = glossary
     
     def translate_text(self, text, source_lang, target_lang):
-        """Translate using LibreTranslate API"""
+        """Translate using LibreTranslate API (languages as codes or names)"""
         try:
+            replacements = []
+            shielded_text = text
+            if self.glossary is not None:
+                shielded_text, replacements = self.glossary.protect(text, source_lang, target_lang)
+            
+            # Accept language names too, so callers can switch backends freely
             data = {
-                'q': text,
-                'source': source_lang,
-                'target': target_lang,
+                'q': shielded_text,
+                'source': language_code(source_lang),
+                'target': language_code(target_lang),
                 'format': 'text'
             }
             
@@ -101,9 +411,767 @@ class LibreTranslator:
             result = response.json()
             
             if 'translatedText' in result:
+                if replacements:
+                    restored = self.glossary.restore(result['translatedText'], replacements)
+                    return GLOSSARY_ERROR if restored is None else restored
                 return result['translatedText']
             else:
                 return "Translation failed"
                 
         except Exception as e:
-            return f"API error: {str(e)}"
\ No newline at end of file
+            return f"API error: {str(e)}"
+
+
+# Catalog file layout (all integers little-endian):
+#   header:  magic, version, entry count
+#   hashes:  count x u64, sorted ascending
+#   entries: count x (key offset, key length, value offset, value length) as u32
+#   strings: UTF-8 keys and values, offsets relative to the start of the file
+CATALOG_MAGIC = b'LTCT'
+CATALOG_VERSION = 1
+CATALOG_EXTENSION = '.ltc'
+_CATALOG_HEADER = struct.Struct('<4sII')
+_CATALOG_HASH = struct.Struct('<Q')
+_CATALOG_ENTRY = struct.Struct('<IIII')
+
+
+def _catalog_hash(key_bytes):
+    """64-bit hash of an encoded catalog key"""
+    return int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), 'little')
+
+
+def catalog_path(catalog_dir, target_lang):
+    """Return the catalog file path for a target language"""
+    name = target_lang.lower()
+    # Only plain names, so a language can never point outside catalog_dir
+    if not name or name in (os.curdir, os.pardir) or os.path.basename(name) != name:
+        raise ValueError(f"Invalid catalog language: {target_lang}")
+    return os.path.join(catalog_dir, name + CATALOG_EXTENSION)
+
+
+def write_catalog(path, translations):
+    """
+    Write a compiled catalog file
+    
+    Args:
+        path: Output file path
+        translations: Mapping of source string to translated string
+    """
+    items = []
+    for key, value in translations.items():
+        key_bytes = key.encode('utf-8')
+        items.append((_catalog_hash(key_bytes), key_bytes, value.encode('utf-8')))
+    items.sort(key=lambda item: (item[0], item[1]))
+    
+    count = len(items)
+    offset = _CATALOG_HEADER.size + count * (_CATALOG_HASH.size + _CATALOG_ENTRY.size)
+    entries = []
+    strings = []
+    for _, key_bytes, value_bytes in items:
+        entries.append(_CATALOG_ENTRY.pack(offset, len(key_bytes),
+                                           offset + len(key_bytes), len(value_bytes)))
+        strings.append(key_bytes)
+        strings.append(value_bytes)
+        offset += len(key_bytes) + len(value_bytes)
+    
+    # Write a temporary file and swap it in: truncating a catalog that a running
+    # CatalogTranslator has mapped would crash it on its next lookup
+    fd, temp_path = tempfile.mkstemp(prefix='.catalog-', suffix='.tmp',
+                                     dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_CATALOG_HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, count))
+            f.writelines(_CATALOG_HASH.pack(item[0]) for item in items)
+            f.writelines(entries)
+            f.writelines(strings)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def build_catalogs(messages, translator, source_lang, target_langs, catalog_dir):
+    """
+    Bulk-translate a source catalog into one compiled file per target language
+    
+    Args:
+        messages: Iterable of source strings
+        translator: Any object with a translate_text method
+        source_lang: Source language of the messages
+        target_langs: Target languages, e.g. Config.POPULAR_LANGUAGES
+        catalog_dir: Directory the catalog files are written to
+        
+    Returns:
+        Dict of target language to list of messages that failed to translate
+    """
+    messages = list(dict.fromkeys(messages))
+    os.makedirs(catalog_dir, exist_ok=True)
+    
+    failures = {}
+    for target_lang in target_langs:
+        translations = {}
+        failures[target_lang] = []
+        for message in messages:
+            result = translator.translate_text(message, source_lang, target_lang)
+            if is_error_result(result):
+                failures[target_lang].append(message)
+            else:
+                translations[message] = result
+        write_catalog(catalog_path(catalog_dir, target_lang), translations)
+    return failures
+
+
+class TranslationCatalog:
+    """Read-only, memory-mapped view of a compiled catalog file"""
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if len(self._mmap) < _CATALOG_HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"Not a translation catalog: {path}")
+        magic, version, self.count = _CATALOG_HEADER.unpack_from(self._mmap, 0)
+        if magic != CATALOG_MAGIC or version != CATALOG_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a translation catalog: {path}")
+        tables_size = self.count * (_CATALOG_HASH.size + _CATALOG_ENTRY.size)
+        if len(self._mmap) < _CATALOG_HEADER.size + tables_size:
+            self._mmap.close()
+            raise ValueError(f"Truncated translation catalog: {path}")
+        self._hashes_offset = _CATALOG_HEADER.size
+        self._entries_offset = self._hashes_offset + self.count * _CATALOG_HASH.size
+    
+    def __len__(self):
+        return self.count
+    
+    def _hash_at(self, index):
+        return _CATALOG_HASH.unpack_from(self._mmap, self._hashes_offset + index * _CATALOG_HASH.size)[0]
+    
+    def lookup(self, text):
+        """
+        Find the translation of a source string
+        
+        Returns:
+            Translated text, or None if the string is not in the catalog
+        """
+        key_bytes = text.encode('utf-8')
+        key_hash = _catalog_hash(key_bytes)
+        
+        # Binary search for the first entry with this hash
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._hash_at(middle) < key_hash:
+                low = middle + 1
+            else:
+                high = middle
+        
+        # Walk the (almost always single) entries sharing the hash
+        size = len(self._mmap)
+        while low < self.count and self._hash_at(low) == key_hash:
+            key_offset, key_length, value_offset, value_length = _CATALOG_ENTRY.unpack_from(
+                self._mmap, self._entries_offset + low * _CATALOG_ENTRY.size)
+            low += 1
+            if key_offset + key_length > size or value_offset + value_length > size:
+                continue    # corrupt entry
+            if key_length == len(key_bytes) and self._mmap[key_offset:key_offset + key_length] == key_bytes:
+                try:
+                    return self._mmap[value_offset:value_offset + value_length].decode('utf-8')
+                except UnicodeDecodeError:
+                    return None
+        return None
+    
+    def close(self):
+        """Unmap the catalog file"""
+        self._mmap.close()
+
+
+class CatalogTranslator:
+    """Serves known strings from compiled catalogs, falling back to a live backend"""
+    
+    AUTO_LANGUAGES = ('auto', 'auto-detect')
+    
+    def __init__(self, catalog_dir, source_lang='english', fallback=None):
+        """
+        Args:
+            catalog_dir: Directory containing catalogs written by build_catalogs
+            source_lang: Source language the catalogs were built from
+            fallback: Translator used for catalog misses (None to report a miss as an error)
+        """
+        self.catalog_dir = catalog_dir
+        self.source_lang = source_lang.lower()
+        self.fallback = fallback
+        self.catalogs = {}     # target language -> TranslationCatalog, or None if missing
+        self._lock = threading.Lock()
+    
+    def get_supported_languages(self):
+        """Return list of supported language names"""
+        if self.fallback is not None:
+            return self.fallback.get_supported_languages()
+        return sorted(
+            name[:-len(CATALOG_EXTENSION)] for name in os.listdir(self.catalog_dir)
+            if name.endswith(CATALOG_EXTENSION)
+        )
+    
+    def get_catalog(self, target_lang):
+        """Return the opened catalog for a target language, or None"""
+        target_lang = target_lang.lower()
+        with self._lock:
+            if target_lang not in self.catalogs:
+                # Invalid names and unreadable files are treated as missing catalogs
+                catalog = None
+                try:
+                    path = catalog_path(self.catalog_dir, target_lang)
+                    if os.path.exists(path):
+                        catalog = TranslationCatalog(path)
+                except (OSError, ValueError):
+                    pass
+                self.catalogs[target_lang] = catalog
+            return self.catalogs[target_lang]
+    
+    def translate_text(self, text, source_lang, target_lang):
+        """Translate from the catalog, or via the fallback backend on a miss"""
+        if source_lang.lower() in (self.source_lang,) + self.AUTO_LANGUAGES:
+            catalog = self.get_catalog(target_lang)
+            if catalog is not None:
+                result = catalog.lookup(text)
+                if result is not None:
+                    return result
+        
+        if self.fallback is None:
+            return "Error: Text not found in catalog"
+        return self.fallback.translate_text(text, source_lang, target_lang)
+    
+    def close(self):
+        """Unmap all opened catalogs"""
+        with self._lock:
+            for catalog in self.catalogs.values():
+                if catalog is not None:
+                    catalog.close()
+            self.catalogs.clear()
+
+
+class Quota:
+    """Character and request limits for one rolling time window"""
+    
+    def __init__(self, seconds, max_characters=None, max_requests=None):
+        if not seconds > 0:
+            raise ValueError(f"Quota window must be positive, got {seconds!r}")
+        for name, limit in (('max_characters', max_characters), ('max_requests', max_requests)):
+            if limit is not None and limit < 0:
+                raise ValueError(f"Quota {name} must not be negative, got {limit!r}")
+        self.seconds = seconds
+        self.max_characters = max_characters
+        self.max_requests = max_requests
+
+
+class RollingWindow:
+    """Character and request totals over a sliding time window"""
+    
+    # Usage is kept in fixed-size buckets so memory does not grow with traffic.
+    # Expiry is per bucket, which errs on the side of staying under quota.
+    BUCKETS = 60
+    
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.bucket_seconds = seconds / self.BUCKETS
+        self.buckets = deque()   # [bucket start, characters, requests]
+        self.characters = 0
+        self.requests = 0
+    
+    def _expire(self, now):
+        """Drop buckets that have slid out of the window"""
+        cutoff = now - self.seconds
+        while self.buckets and self.buckets[0][0] + self.bucket_seconds <= cutoff:
+            _, characters, requests_ = self.buckets.popleft()
+            self.characters -= characters
+            self.requests -= requests_
+    
+    def add(self, now, characters, requests_=1):
+        """Record usage at the given time"""
+        self._expire(now)
+        start = now - now % self.bucket_seconds
+        if self.buckets and self.buckets[-1][0] == start:
+            self.buckets[-1][1] += characters
+            self.buckets[-1][2] += requests_
+        else:
+            self.buckets.append([start, characters, requests_])
+        self.characters += characters
+        self.requests += requests_
+    
+    def totals(self, now):
+        """Return (characters, requests) used within the window"""
+        self._expire(now)
+        return self.characters, self.requests
+    
+    def time_until_available(self, now, quota, characters):
+        """
+        Seconds until a request of the given size fits under the quota
+        
+        Returns:
+            0 if it fits now, a wait in seconds, or None if it can never fit
+        """
+        self._expire(now)
+        if quota.max_characters is not None and characters > quota.max_characters:
+            return None
+        if quota.max_requests is not None and quota.max_requests < 1:
+            return None
+        
+        excess_characters = 0
+        excess_requests = 0
+        if quota.max_characters is not None:
+            excess_characters = self.characters + characters - quota.max_characters
+        if quota.max_requests is not None:
+            excess_requests = self.requests + 1 - quota.max_requests
+        if excess_characters <= 0 and excess_requests <= 0:
+            return 0
+        
+        # Find the oldest bucket whose expiry frees enough room
+        freed_characters = 0
+        freed_requests = 0
+        for start, bucket_characters, bucket_requests in self.buckets:
+            freed_characters += bucket_characters
+            freed_requests += bucket_requests
+            if freed_characters >= excess_characters and freed_requests >= excess_requests:
+                return max(0, start + self.bucket_seconds + self.seconds - now)
+        return None
+
+
+class UsageTracker:
+    """Per-backend character and request accounting against rolling quotas"""
+    
+    def __init__(self, quotas=None, clock=time.time):
+        """
+        Args:
+            quotas: Dict of backend name to a list of Quota objects or
+                    {'seconds', 'max_characters', 'max_requests'} dicts matching
+                    your plan, e.g. {'google': [{'seconds': 60, 'max_characters': 100000}]}
+            clock: Wall-clock time function (usage is persisted across restarts)
+        """
+        self.clock = clock
+        self.quotas = {}
+        for backend, backend_quotas in (quotas or {}).items():
+            self.quotas[backend] = [
+                quota if isinstance(quota, Quota) else Quota(**quota)
+                for quota in backend_quotas
+            ]
+        self.usage = {}      # backend -> {'characters': total, 'requests': total}
+        self.windows = {}    # backend -> {seconds: RollingWindow}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+    
+    def _get_windows(self, backend):
+        """Return the rolling windows tracked for a backend"""
+        windows = self.windows.get(backend)
+        if windows is None:
+            windows = {quota.seconds: RollingWindow(quota.seconds)
+                       for quota in self.quotas.get(backend, [])}
+            self.windows[backend] = windows
+        return windows
+    
+    def record(self, backend, characters, requests_=1):
+        """Record usage for a backend"""
+        with self._lock:
+            now = self.clock()
+            totals = self.usage.setdefault(backend, {'characters': 0, 'requests': 0})
+            totals['characters'] += characters
+            totals['requests'] += requests_
+            for window in self._get_windows(backend).values():
+                window.add(now, characters, requests_)
+    
+    def time_until_available(self, backend, characters):
+        """
+        Seconds until a backend can take a request of the given size
+        
+        Returns:
+            0 if it fits now, a wait in seconds, or None if it can never fit
+        """
+        with self._lock:
+            now = self.clock()
+            windows = self._get_windows(backend)
+            longest_wait = 0
+            for quota in self.quotas.get(backend, []):
+                wait = windows[quota.seconds].time_until_available(now, quota, characters)
+                if wait is None:
+                    return None
+                longest_wait = max(longest_wait, wait)
+            return longest_wait
+    
+    def get_usage(self, backend):
+        """
+        Return usage counters for a backend
+        
+        Returns:
+            Dict with lifetime 'characters' and 'requests' totals and a
+            'windows' dict of window seconds to current window totals
+        """
+        with self._lock:
+            now = self.clock()
+            totals = self.usage.get(backend, {'characters': 0, 'requests': 0})
+            windows = {}
+            for seconds, window in self._get_windows(backend).items():
+                characters, requests_ = window.totals(now)
+                windows[seconds] = {'characters': characters, 'requests': requests_}
+            return {'characters': totals['characters'], 'requests': totals['requests'],
+                    'windows': windows}
+    
+    def save_to_file(self, filepath):
+        """Save usage counters to file, replacing it atomically"""
+        with self._save_lock:
+            with self._lock:
+                data = {}
+                for backend, totals in self.usage.items():
+                    data[backend] = {
+                        'characters': totals['characters'],
+                        'requests': totals['requests'],
+                        'windows': {str(seconds): [list(bucket) for bucket in window.buckets]
+                                    for seconds, window in self._get_windows(backend).items()}
+                    }
+            
+            # Write a temporary file next to the target and swap it in, so a crash
+            # mid-write never leaves a truncated usage file behind
+            temp_path = None
+            try:
+                directory = os.path.dirname(os.path.abspath(filepath))
+                fd, temp_path = tempfile.mkstemp(prefix='.usage-', suffix='.tmp', dir=directory)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, filepath)
+                temp_path = None
+            except Exception as e:
+                print(f"Error saving usage: {e}")
+            finally:
+                if temp_path is not None and os.path.exists(temp_path):
+                    os.remove(temp_path)
+    
+    def load_from_file(self, filepath):
+        """Load usage counters from file"""
+        try:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading usage: {e}")
+            return
+        
+        with self._lock:
+            now = self.clock()
+            for backend, saved in data.items():
+                self.usage[backend] = {'characters': saved.get('characters', 0),
+                                       'requests': saved.get('requests', 0)}
+                windows = self._get_windows(backend)
+                for seconds, buckets in saved.get('windows', {}).items():
+                    window = windows.get(float(seconds))
+                    if window is None:
+                        continue
+                    window.buckets = deque(list(bucket) for bucket in buckets)
+                    window.characters = sum(bucket[1] for bucket in buckets)
+                    window.requests = sum(bucket[2] for bucket in buckets)
+                    window.totals(now)
+
+
+class QuotaScheduler:
+    """Routes translations across backends so each stays under its quotas"""
+    
+    def __init__(self, backends, tracker, max_text_length=5000, max_wait=30.0,
+                 usage_file=None, save_interval=5.0, sleep=time.sleep):
+        """
+        Args:
+            backends: Ordered dict of backend name to translator, most preferred first
+            tracker: UsageTracker holding the quotas for those names
+            max_text_length: Longest text accepted, e.g. Config.MAX_TEXT_LENGTH
+            max_wait: Longest time in seconds to queue a request waiting for quota
+            usage_file: Optional file usage is loaded from and periodically saved to
+                        (no file means usage is not kept across restarts)
+            save_interval: Minimum seconds between saves of usage_file
+            sleep: Sleep function used while queueing
+        """
+        self.backends = backends
+        self.tracker = tracker
+        self.max_text_length = max_text_length
+        self.max_wait = max_wait
+        self.usage_file = usage_file
+        self.save_interval = save_interval
+        self.sleep = sleep
+        self._last_save = tracker.clock()
+        self._lock = threading.Lock()
+        
+        if usage_file and os.path.exists(usage_file):
+            tracker.load_from_file(usage_file)
+    
+    def get_supported_languages(self):
+        """Return list of supported language names"""
+        backend = next(iter(self.backends.values()))
+        return backend.get_supported_languages()
+    
+    def get_usage(self):
+        """Return usage counters for every backend"""
+        return {name: self.tracker.get_usage(name) for name in self.backends}
+    
+    def _reserve(self, characters):
+        """
+        Claim quota on the first backend with room
+        
+        Returns:
+            (backend name, None) on success, otherwise (None, shortest wait or None)
+        """
+        with self._lock:
+            shortest_wait = None
+            for name in self.backends:
+                wait = self.tracker.time_until_available(name, characters)
+                if wait == 0:
+                    self.tracker.record(name, characters)
+                    return name, None
+                if wait is not None and (shortest_wait is None or wait < shortest_wait):
+                    shortest_wait = wait
+            return None, shortest_wait
+    
+    def translate_text(self, text, source_lang, target_lang):
+        """Translate on the preferred backend with quota, queueing if all are full"""
+        characters = len(text)
+        if characters > self.max_text_length:
+            return f"Error: Text exceeds maximum length of {self.max_text_length} characters"
+        
+        deadline = self.tracker.clock() + self.max_wait
+        while True:
+            name, wait = self._reserve(characters)
+            if name is not None:
+                break
+            if wait is None or self.tracker.clock() + wait > deadline:
+                return "Error: Translation quota exceeded"
+            self.sleep(wait)
+        
+        self._maybe_save()
+        return self.backends[name].translate_text(text, source_lang, target_lang)
+    
+    def _maybe_save(self):
+        """Persist usage if the save interval has elapsed"""
+        if not self.usage_file:
+            return
+        now = self.tracker.clock()
+        with self._lock:
+            if now - self._last_save < self.save_interval:
+                return
+            self._last_save = now
+        self.tracker.save_to_file(self.usage_file)
+    
+    def close(self):
+        """Persist usage immediately"""
+        if self.usage_file:
+            self.tracker.save_to_file(self.usage_file)
+
+
+class PriorityScheduler:
+    """Runs translations in priority order so interactive requests preempt bulk jobs"""
+    
+    INTERACTIVE = 'interactive'
+    NORMAL = 'normal'
+    BULK = 'bulk'
+    PRIORITIES = (INTERACTIVE, NORMAL, BULK)
+    
+    def __init__(self, translator, workers=4, reserved_workers=1, aging_interval=10.0,
+                 weights=None, clock=time.monotonic):
+        """
+        Args:
+            translator: Backend with translate_text (a translator or QuotaScheduler)
+            workers: Number of worker threads
+            reserved_workers: Workers that only take interactive requests, so an
+                              interactive request never waits behind bulk work
+            aging_interval: Seconds of waiting that promote a request by one class
+            weights: Dict of tenant to fair-queuing weight (default 1)
+            clock: Monotonic time function
+        """
+        self.translator = translator
+        self.aging_interval = aging_interval
+        self.weights = {}
+        for tenant, weight in (weights or {}).items():
+            self._check_weight(tenant, weight)
+            self.weights[tenant] = weight
+        self.clock = clock
+        
+        # Each class keeps a heap ordered by fair-queuing finish tag and a FIFO in
+        # arrival order; a request taken from one is marked and skipped in the other
+        self._queues = {priority: [] for priority in self.PRIORITIES}
+        self._arrivals = {priority: deque() for priority in self.PRIORITIES}
+        self._depth = {priority: 0 for priority in self.PRIORITIES}
+        self._virtual_time = {priority: 0.0 for priority in self.PRIORITIES}
+        self._last_finish = {priority: {} for priority in self.PRIORITIES}  # tenant -> tag
+        self._sequence = 0
+        self._metrics = {priority: {'started': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+                         for priority in self.PRIORITIES}
+        self._running = True
+        self._condition = threading.Condition()
+        
+        self._workers = []
+        for index in range(max(workers, 1)):
+            interactive_only = index < min(reserved_workers, workers - 1)
+            worker = threading.Thread(target=self._work, args=(interactive_only,), daemon=True)
+            worker.start()
+            self._workers.append(worker)
+    
+    def get_supported_languages(self):
+        """Return list of supported language names"""
+        return self.translator.get_supported_languages()
+    
+    @staticmethod
+    def _check_weight(tenant, weight):
+        if not weight > 0:
+            raise ValueError(f"Weight for {tenant!r} must be positive, got {weight!r}")
+    
+    def set_weight(self, tenant, weight):
+        """Set the fair-queuing weight of a tenant or job"""
+        self._check_weight(tenant, weight)
+        with self._condition:
+            self.weights[tenant] = weight
+    
+    def submit(self, text, source_lang, target_lang, priority=NORMAL, tenant='default'):
+        """
+        Queue a translation
+        
+        Args:
+            text: Text to translate
+            source_lang: Source language name
+            target_lang: Target language name
+            priority: One of PRIORITIES
+            tenant: Tenant or job the request belongs to, for fair queuing
+            
+        Returns:
+            Future resolving to the translate_text result
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority: {priority}")
+        
+        future = Future()
+        with self._condition:
+            if not self._running:
+                raise RuntimeError("Scheduler is closed")
+            # Weighted fair queuing: a tenant's requests are spaced by cost / weight
+            # in virtual time, so heavy tenants cannot crowd out light ones
+            cost = max(len(text), 1) / self.weights.get(tenant, 1)
+            start = max(self._virtual_time[priority], self._last_finish[priority].get(tenant, 0.0))
+            finish = start + cost
+            self._last_finish[priority][tenant] = finish
+            
+            self._sequence += 1
+            # [finish tag, sequence, enqueue time, tenant, arguments, future, taken]
+            request = [finish, self._sequence, self.clock(), tenant,
+                       (text, source_lang, target_lang), future, False]
+            heapq.heappush(self._queues[priority], request)
+            self._arrivals[priority].append(request)
+            self._depth[priority] += 1
+            self._condition.notify_all()
+        return future
+    
+    def translate_text(self, text, source_lang, target_lang, priority=INTERACTIVE, tenant='default'):
+        """Translate text, waiting for the result (interactive priority by default)"""
+        return self.submit(text, source_lang, target_lang, priority, tenant).result()
+    
+    def _oldest(self, priority):
+        """Return the longest-waiting request of a class, dropping stale entries"""
+        arrivals = self._arrivals[priority]
+        while arrivals[0][6]:
+            arrivals.popleft()
+        queue = self._queues[priority]
+        while queue[0][6]:
+            heapq.heappop(queue)
+        return arrivals[0]
+    
+    def _next_request(self, interactive_only):
+        """Pop the next request to run, or None if nothing is eligible"""
+        if interactive_only:
+            candidates = (self.INTERACTIVE,)
+        else:
+            candidates = self.PRIORITIES
+        
+        now = self.clock()
+        best = None
+        top_rank = None
+        for rank, priority in enumerate(candidates):
+            if not self._depth[priority]:
+                continue
+            if top_rank is None:
+                top_rank = rank
+            # Aging: the oldest waiting request gradually competes with higher classes
+            waited = now - self._oldest(priority)[2]
+            effective_rank = rank - waited / self.aging_interval if self.aging_interval else rank
+            if best is None or effective_rank < best[0]:
+                best = (effective_rank, priority, rank)
+        
+        if best is None:
+            return None
+        _, priority, rank = best
+        if rank > top_rank:
+            # Promoted over a busier class by aging: serve the request that waited longest
+            request = self._arrivals[priority].popleft()
+        else:
+            request = heapq.heappop(self._queues[priority])
+        request[6] = True
+        self._depth[priority] -= 1
+        self._virtual_time[priority] = max(self._virtual_time[priority], request[0])
+        if not self._depth[priority]:
+            self._queues[priority].clear()
+            self._arrivals[priority].clear()
+            # Idle class: restart virtual time so stale tags do not penalize tenants
+            self._virtual_time[priority] = 0.0
+            self._last_finish[priority].clear()
+        
+        metrics = self._metrics[priority]
+        wait = now - request[2]
+        metrics['started'] += 1
+        metrics['total_wait'] += wait
+        metrics['max_wait'] = max(metrics['max_wait'], wait)
+        return request
+    
+    def _work(self, interactive_only):
+        """Worker thread loop"""
+        while True:
+            with self._condition:
+                request = self._next_request(interactive_only)
+                while request is None:
+                    if not self._running:
+                        return
+                    self._condition.wait()
+                    request = self._next_request(interactive_only)
+            
+            future = request[5]
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.translator.translate_text(*request[4]))
+            except Exception as e:
+                future.set_exception(e)
+    
+    def get_metrics(self):
+        """
+        Return queue metrics per priority class
+        
+        Returns:
+            Dict of priority to 'queue_depth', 'oldest_wait', 'started',
+            'average_wait' and 'max_wait' (waits in seconds until a worker took it)
+        """
+        with self._condition:
+            now = self.clock()
+            metrics = {}
+            for priority in self.PRIORITIES:
+                depth = self._depth[priority]
+                counters = self._metrics[priority]
+                started = counters['started']
+                metrics[priority] = {
+                    'queue_depth': depth,
+                    'oldest_wait': now - self._oldest(priority)[2] if depth else 0.0,
+                    'started': started,
+                    'average_wait': counters['total_wait'] / started if started else 0.0,
+                    'max_wait': counters['max_wait']
+                }
+            return metrics
+    
+    def close(self, wait=True):
+        """Stop accepting requests and let workers finish the queue"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
@@ -2,8 +2,289 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+from tkinter import font as tkfont
+from array import array
+from bisect import bisect_right
 import pyperclip
 
+
+class TextBuffer:
+    """Append-only text storage indexed by line"""
+    
+    # Very long lines are split so a single line never has to be rendered whole
+    MAX_LINE_LENGTH = 1000
+    
+    def __init__(self):
+        self.clear()
+    
+    def clear(self):
+        """Remove all text"""
+        self.chunks = []
+        self.chunk_starts = array('q')
+        self.line_starts = array('q', [0])
+        self.length = 0
+        self._last_line_length = 0
+    
+    @property
+    def line_count(self):
+        return len(self.line_starts)
+    
+    def append(self, text):
+        """Add text to the end of the buffer"""
+        if not text:
+            return
+        offset = self.length
+        self.chunks.append(text)
+        self.chunk_starts.append(offset)
+        
+        position = 0
+        while True:
+            newline = text.find('\n', position)
+            stop = len(text) if newline < 0 else newline
+            while self._last_line_length + (stop - position) > self.MAX_LINE_LENGTH:
+                position += self.MAX_LINE_LENGTH - self._last_line_length
+                self.line_starts.append(offset + position)
+                self._last_line_length = 0
+            self._last_line_length += stop - position
+            if newline < 0:
+                break
+            position = newline + 1
+            self.line_starts.append(offset + position)
+            self._last_line_length = 0
+        self.length += len(text)
+    
+    def line_of(self, offset):
+        """Return the index of the line containing a character offset"""
+        return max(bisect_right(self.line_starts, offset) - 1, 0)
+    
+    def line_end(self, line):
+        """Return the offset just past the end of a line (including its newline)"""
+        if line + 1 < self.line_count:
+            return self.line_starts[line + 1]
+        return self.length
+    
+    def get_range(self, start, end):
+        """Return the text between two character offsets"""
+        if start >= end:
+            return ''
+        index = max(bisect_right(self.chunk_starts, start) - 1, 0)
+        parts = []
+        while index < len(self.chunks) and self.chunk_starts[index] < end:
+            chunk_start = self.chunk_starts[index]
+            parts.append(self.chunks[index][max(start - chunk_start, 0):end - chunk_start])
+            index += 1
+        return ''.join(parts)
+    
+    def get_lines(self, first, last):
+        """Return the text of lines first..last (exclusive)"""
+        last = min(last, self.line_count)
+        if first >= last:
+            return ''
+        return self.get_range(self.line_starts[first], self.line_end(last - 1))
+    
+    def get_text(self):
+        """Return the whole buffer as one string"""
+        return ''.join(self.chunks)
+    
+    def iter_chunks(self):
+        """Yield the buffer contents piece by piece"""
+        return iter(self.chunks)
+
+
+class VirtualTextView(ttk.Frame):
+    """Read-only text view that only renders a window of a large buffer around what is visible"""
+    
+    SCROLL_UNITS = 3
+    
+    def __init__(self, parent, height=8, width=70, font=("Arial", 11), wrap=tk.WORD):
+        super().__init__(parent)
+        self.buffer = TextBuffer()
+        self.visible_lines = height
+        self.top_char = 0            # buffer offset of the first visible character
+        self.window_start = 0        # buffer offsets of the text held by the widget
+        self.window_end = 0
+        self.on_scroll = None        # called with the new top fraction when the user scrolls
+        
+        self._rendering = False
+        self.text = tk.Text(self, height=height, width=width, wrap=wrap, font=font,
+                            state=tk.DISABLED, yscrollcommand=self._on_text_scrolled)
+        self.text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        
+        self.line_height = max(tkfont.Font(font=font).metrics('linespace'), 1)
+        self.text.bind('<Configure>', self._on_resize)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.text.bind(sequence, self._on_mousewheel)
+        self._render(0)
+    
+    @property
+    def margin(self):
+        """Buffer lines kept rendered above and below the visible rows"""
+        return 2 * self.visible_lines
+    
+    def _count(self, index1, index2, option):
+        """Return a Text.count result as a plain integer"""
+        result = self.text.count(index1, index2, 'update', option)
+        if isinstance(result, tuple):
+            result = result[0]
+        return int(result) if result else 0
+    
+    def _widget_index(self, char):
+        """Text widget index of a buffer offset inside the rendered window"""
+        return f"1.0 + {char - self.window_start} chars"
+    
+    def _render(self, top_char):
+        """Materialize the lines around top_char into the widget and scroll it to the top"""
+        self._rendering = True
+        try:
+            self._fill(top_char)
+        finally:
+            self._rendering = False
+        self._read_top()
+    
+    def _fill(self, top_char):
+        """Replace the widget contents with the window around top_char"""
+        top_line = self.buffer.line_of(top_char)
+        first_line = max(top_line - self.margin, 0)
+        last_line = min(top_line + self.visible_lines + self.margin, self.buffer.line_count)
+        self.window_start = self.buffer.line_starts[first_line]
+        self.window_end = self.buffer.line_end(last_line - 1)
+        
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(1.0, self.buffer.get_range(self.window_start, self.window_end))
+        self.text.config(state=tk.DISABLED)
+        
+        # Scroll by display rows so wrapped lines stay reachable row by row
+        self.text.yview_moveto(0)
+        rows = self._count('1.0', self._widget_index(top_char), 'displaylines')
+        if rows:
+            self.text.yview_scroll(rows, tk.UNITS)
+    
+    def _read_top(self):
+        """Update top_char from the widget and reposition the scrollbar"""
+        self.top_char = self.window_start + self._count('1.0', '@0,0', 'chars')
+        bottom_char = self.window_start + self._count('1.0', f'@0,{self.text.winfo_height()}', 'chars')
+        self.scrollbar.set(self._fraction(self.top_char),
+                           max(self._fraction(bottom_char + 1), self._fraction(self.top_char)))
+    
+    def _fraction(self, char):
+        """Approximate scroll fraction of a buffer offset, measured in buffer lines"""
+        line = self.buffer.line_of(char)
+        start = self.buffer.line_starts[line]
+        length = max(self.buffer.line_end(line) - start, 1)
+        return min((line + min(char - start, length) / length) / self.buffer.line_count, 1.0)
+    
+    def _needs_rerender(self):
+        """Check whether the visible rows are close to the edges of the rendered window"""
+        top_line = self.buffer.line_of(self.top_char)
+        if self.window_start > 0:
+            if top_line - self.buffer.line_of(self.window_start) < self.visible_lines:
+                return True
+        if self.window_end < self.buffer.length:
+            if self.buffer.line_of(self.window_end) - top_line < 2 * self.visible_lines:
+                return True
+        return False
+    
+    def _scrolled(self, previous_top, notify):
+        """Finish a scroll: re-window if needed and tell listeners"""
+        if self._needs_rerender():
+            self._render(self.top_char)
+        if notify and self.on_scroll is not None and self.top_char != previous_top:
+            self.on_scroll(self._fraction(self.top_char))
+    
+    def set_text(self, text):
+        """Replace the contents of the view"""
+        self.buffer.clear()
+        self.buffer.append(text)
+        self._render(0)
+    
+    def append(self, text):
+        """Add text to the end, touching the widget only if the tail is rendered"""
+        tail_rendered = self.window_end == self.buffer.length
+        self.buffer.append(text)
+        if not tail_rendered:
+            self._read_top()
+            return
+        
+        top_line = self.buffer.line_of(self.top_char)
+        if self.buffer.line_count - top_line <= self.visible_lines + self.margin:
+            self.text.config(state=tk.NORMAL)
+            self.text.insert(tk.END + '-1c', text)
+            self.text.config(state=tk.DISABLED)
+            self.window_end = self.buffer.length
+            self._read_top()
+        else:
+            # The window would grow past its bounds; trim it around the visible rows
+            self._render(self.top_char)
+    
+    def clear(self):
+        """Remove all text"""
+        self.set_text('')
+    
+    def get_text(self):
+        """Return the full contents from the backing buffer"""
+        return self.buffer.get_text()
+    
+    def iter_chunks(self):
+        """Yield the full contents from the backing buffer piece by piece"""
+        return self.buffer.iter_chunks()
+    
+    def scroll(self, amount, what=tk.UNITS, notify=True):
+        """Scroll by display rows (units) or pages"""
+        previous_top = self.top_char
+        self.text.yview_scroll(amount, what)
+        self._read_top()
+        self._scrolled(previous_top, notify)
+    
+    def yview_moveto(self, fraction, notify=True):
+        """Scroll so the given fraction of the text is at the top"""
+        position = min(max(float(fraction), 0.0), 1.0) * self.buffer.line_count
+        line = min(int(position), self.buffer.line_count - 1)
+        start = self.buffer.line_starts[line]
+        char = start + int((position - line) * (self.buffer.line_end(line) - start))
+        
+        previous_top = self.top_char
+        self._render(char)
+        self._scrolled(previous_top, notify)
+    
+    def yview(self, *args):
+        """Scrollbar command handler"""
+        if not args:
+            return
+        if args[0] == tk.MOVETO:
+            self.yview_moveto(args[1])
+        elif args[0] == tk.SCROLL:
+            self.scroll(int(args[1]), args[2])
+    
+    def _on_text_scrolled(self, first, last):
+        # The Text also scrolls itself (drag-select, keyboard navigation), so
+        # follow any view change that did not come from our own rendering
+        if self._rendering:
+            return
+        previous_top = self.top_char
+        self._read_top()
+        self._scrolled(previous_top, notify=True)
+    
+    def _on_resize(self, event):
+        # Re-wrap at the new width, keeping the same text at the top
+        self.visible_lines = max(event.height // self.line_height, 1)
+        self._render(self.top_char)
+    
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            direction = -1
+        elif event.num == 5:
+            direction = 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self.scroll(direction * self.SCROLL_UNITS)
+        return "break"
+
+
 class TranslationApp:
     """Main GUI application for translation"""
     
@@ -79,11 +360,16 @@ class TranslationApp:
         
         # Output text area
         ttk.Label(main_frame, text="Translation:", font=("Arial", 12)).grid(row=5, column=0, columnspan=4, sticky=tk.W, pady=(20, 5))
-        self.output_text = scrolledtext.ScrolledText(main_frame, height=8, width=70, 
-                                                    wrap=tk.WORD, font=("Arial", 11),
-                                                    state=tk.DISABLED)
+        self.output_text = VirtualTextView(main_frame, height=8, width=70,
+                                           wrap=tk.WORD, font=("Arial", 11))
         self.output_text.grid(row=6, column=0, columnspan=4, sticky=(tk.W, tk.E))
         
+        # Keep source and translation scrolled side by side
+        self.output_text.on_scroll = self.input_text.yview_moveto
+        self.input_text.vbar.config(command=self.scroll_source)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.input_text.bind(sequence, self.on_source_mousewheel, add='+')
+        
         # Status bar
         self.status_var = tk.StringVar()
         self.status_var.set("Ready to translate")
@@ -121,10 +407,7 @@ class TranslationApp:
             result = self.translator.translate_text(input_text, source_lang, target_lang)
             
             # Display result
-            self.output_text.config(state=tk.NORMAL)
-            self.output_text.delete(1.0, tk.END)
-            self.output_text.insert(1.0, result)
-            self.output_text.config(state=tk.DISABLED)
+            self.output_text.set_text(result)
             
             self.status_var.set("Translation completed successfully")
             
@@ -138,22 +421,30 @@ class TranslationApp:
     def clear_all(self):
         """Clear all text areas"""
         self.input_text.delete(1.0, tk.END)
-        self.output_text.config(state=tk.NORMAL)
-        self.output_text.delete(1.0, tk.END)
-        self.output_text.config(state=tk.DISABLED)
+        self.output_text.clear()
         self.status_var.set("Ready to translate")
     
+    def scroll_source(self, *args):
+        """Scroll the source text from its scrollbar and follow with the translation"""
+        self.input_text.yview(*args)
+        self.output_text.yview_moveto(self.input_text.yview()[0], notify=False)
+    
+    def on_source_mousewheel(self, event):
+        """Follow mouse wheel scrolling of the source text once Tk has applied it"""
+        self.root.after_idle(
+            lambda: self.output_text.yview_moveto(self.input_text.yview()[0], notify=False))
+    
     def copy_translation(self):
         """Copy translation to clipboard"""
-        translation = self.output_text.get(1.0, tk.END).strip()
-        if translation:
+        if self.output_text.buffer.length:
             try:
-                pyperclip.copy(translation)
+                pyperclip.copy(self.output_text.get_text())
                 self.status_var.set("Translation copied to clipboard")
             except:
                 # Fallback if pyperclip is not available
                 self.root.clipboard_clear()
-                self.root.clipboard_append(translation)
+                for chunk in self.output_text.iter_chunks():
+                    self.root.clipboard_append(chunk)
                 self.status_var.set("Translation copied to clipboard")
         else:
             messagebox.showwarning("Warning", "No translation to copy")
@@ -193,7 +484,7 @@ class SimpleTranslationApp:
         
         # Output
         tk.Label(self.root, text="Translation:", font=("Arial", 12)).pack()
-        self.output_text = tk.Text(self.root, height=5, width=60, state=tk.DISABLED)
+        self.output_text = VirtualTextView(self.root, height=5, width=60, font='TkFixedFont')
         self.output_text.pack(pady=5)
     
     def simple_translate(self):
@@ -203,8 +494,4 @@ class SimpleTranslationApp:
         
         if text and target_lang:
             result = self.translator.translate_text(text, 'auto', target_lang)
-            
-            self.output_text.config(state=tk.NORMAL)
-            self.output_text.delete(1.0, tk.END)
-            self.output_text.insert(1.0, result)
-            self.output_text.config(state=tk.DISABLED)
\ No newline at end of file
+            self.output_text.set_text(result)
\ No newline at end of file